@@ -2,7 +2,6 @@ import yaml
 import json
 
 from helpers.bls import BLS
-import pandas as pd
 
 with open("config.yaml", "r") as file:
     config = yaml.safe_load(file)
@@ -17,7 +16,7 @@ bls_series_the_employment_situation = {
 
 return_raw_response = True
 
-series = bls.get_series(list(bls_series_the_employment_situation.values()), all_optional_params=True, return_raw_response=return_raw_response)
+series = bls.get_series(list(bls_series_the_employment_situation.values()), all_optional_params=True, return_raw_response=return_raw_response, return_dataframe=True)
 
 if return_raw_response:
     # Convert response to JSON and write to file
@@ -25,5 +24,4 @@ if return_raw_response:
     with open('bls_response.json', 'w') as f:
         json.dump(json_data, f, indent=4)
 else:
-    series_df = pd.DataFrame.from_dict(series)
-    series_df.to_csv('bls_test_multiple_series.csv', index=False, mode='w')
\ No newline at end of file
+    series.to_csv('bls_test_multiple_series.csv', index=False, mode='w')
\ No newline at end of file
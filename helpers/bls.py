@@ -1,10 +1,81 @@
 #!/usr/bin/env python3
 """API client implementations."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
+import hashlib
+import json
+import logging
+import threading
+import time
 import warnings
 
-from .web import SessionManager
+import pandas as pd
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .web import get_default_session
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Errors raised while decoding or reading an unexpected response body; anything else propagates
+_PARSE_ERRORS = (ValueError, KeyError, requests.exceptions.JSONDecodeError) + ((ijson.JSONError,) if ijson else ())
+
+# -- Constants -----------------------------------------------------------------------------
+MAX_SERIES_PER_QUERY = 50
+MAX_CONCURRENT_QUERIES = 8 # Kept below helpers.web.DEFAULT_POOL_MAXSIZE so each worker gets a pooled connection
+# Prefer brotli for the JSON payloads, but only advertise it when urllib3 can decode it (brotli/brotlicffi installed)
+_ACCEPT_ENCODING = 'br, gzip' if 'br' in ACCEPT_ENCODING.split(',') else 'gzip'
+
+# LAUS and CES series ID suffixes following the state FIPS code
+_LAUS_TAILS = (
+    '0000000000003', # Unemployment Rate
+    '0000000000004', # Unemployment
+    '0000000000005', # Employment
+    '0000000000006', # Labor Force
+    '0000000000007', # Employment-Populatio Ratio
+    '0000000000008', # Labor Force Participation Rate
+)
+_CES_TAILS = (
+    '000000000000001', # Total Nonfarm, All Employees, In Thousands, Seasonally Adjusted
+    '000000500000001', # Total Private, All Employees, In Thousands, Seasonally Adjusted
+    '000000600000001', # Goods Producing, All Employees, In Thousands, Seasonally Adjusted
+    '000000700000001', # Service-Providing, All Employees, In Thousands, Seasonally Adjusted
+    '000000800000001', # Private Service Providing, All Employees, In Thousands, Seasonally Adjusted
+    '000001000000001', # Mining/Logging, All Employees, In Thousands, Seasonally Adjusted
+    '000001500000001', # Mining/Logging/Construction, All Employees, In Thousands, Seasonally Adjusted
+    '000002000000001', # Construction, All Employees, In Thousands, Seasonally Adjusted
+)
+
+# Row schema of flattened series data, keyed by the catalog | calculations << 1 | aspects << 2 flag bitmask
+_CATALOG_FIELDS = ('series_title', 'seasonality', 'measure_data_type', 'commerce_industry', 'commerce_sector')
+_CALCULATION_KEYS = tuple(
+    (calc_type, period)
+    for calc_type in ('net_changes', 'pct_changes')
+    for period in ('1', '3', '6', '12')
+)
+_SCHEMA_CACHE = {
+    flags: (
+        ('series_id',)
+        + (_CATALOG_FIELDS if flags & 1 else ())
+        + ('year', 'period', 'period_name', 'value', 'footnotes')
+        + (('aspects',) if flags & 4 else ())
+        + (tuple(f'{calc_type}_{period}' for calc_type, period in _CALCULATION_KEYS) if flags & 2 else ())
+    )
+    for flags in range(8)
+}
 
 # -- API Objects ----------------------------------------------------------------------------
 
@@ -18,25 +89,83 @@ class BLSWarning(Warning):
     """Warning raised when BLS API client encounters non-critical issues."""
     pass
 
+# -- Parsing ------------------------------------------------------------------------------
+def _flatten_series(bls_series, catalog: bool, calculations: bool, aspects: bool) -> tuple:
+    """Flatten BLS series payloads into one row per data point.
+    
+    Args:
+        bls_series: Iterable of series objects from Results.series
+        catalog: Include the series catalog fields
+        calculations: Include net and percent change calculations
+        aspects: Include data point aspects
+        
+    Returns:
+        Tuple of the column names and a list of row tuples in that column order
+    """
+    """
+    2025.01.26 -- Hamza Amjad
+    Note to self -- not including any period validation
+    Python example on https://www.bls.gov/developers/api_python.htm
+    Includes the following validation
+    if 'M01' <= period <= 'M12':
+        x.add_row([seriesId,year,period,value,footnotes[0:-1]])
+
+    2025.02.01 -- Hamza Amjad
+    If annualaverage is set to true, it is returned as M13 in the data set
+    So that needs to be handled appropriately. For now, not adding handling for this
+    I likely won't need annual averages for the work I'm doing at the moment
+    """
+    columns = _SCHEMA_CACHE[bool(catalog) | bool(calculations) << 1 | bool(aspects) << 2]
+    rows = []
+    append = rows.append
+    for series in bls_series:
+        series_fields = (series["seriesID"],)
+        if catalog:
+            series_catalog = series.get("catalog", {})
+            series_fields += tuple(series_catalog.get(field) for field in _CATALOG_FIELDS)
+
+        for data in series.get("data", []):
+            row = series_fields + (data["year"], data["period"], data["periodName"], data["value"], data.get("footnotes", ""))
+            if aspects:
+                row += (data.get("aspects", {}),)
+            if calculations:
+                data_calculations = data.get("calculations", {})
+                row += tuple(data_calculations.get(calc_type, {}).get(period) for calc_type, period in _CALCULATION_KEYS)
+            append(row)
+
+    return columns, rows
+
+def _format_rows(columns: tuple, rows: list, return_dataframe: bool):
+    """Build the get_series output from flattened rows, either a list of dicts or a DataFrame."""
+    if return_dataframe:
+        return pd.DataFrame.from_records(rows, columns=columns)
+    return [dict(zip(columns, row)) for row in rows]
+
 # -- BLS ----------------------------------------------------------------------------------
 class BLS:
+    HEADERS = {
+        'Content-type': 'application/json',
+        'Accept-Encoding': _ACCEPT_ENCODING
+        }
+
     def __init__(
         self, 
-        api_key: str = ''
+        api_key: str = '',
+        session: Optional[requests.Session] = None
         ) -> None:
         """Initialize the BLS interface.
         
         Args:
             api_key: BLS API Key
+            session: Optional session to use, defaults to the shared session from helpers.web
             
         Raises:
             Not configured at this time.
         """
-        self.session = SessionManager().create_session()
-        self.headers = {
-            'Content-type': 'application/json'
-            }
+        self.session = session or get_default_session()
         self.api_key = api_key
+        self._cache = {}
+        self._cache_lock = threading.Lock()
         
         self.api_url = {
             'base_url' : 'https://api.bls.gov/publicAPI/v2/',
@@ -50,14 +179,78 @@ class BLS:
                 ]
             }
         }
+        self._timeseries_url = self.api_url['base_url'] + self.api_url['endpoints']['timeseries'][0]
         """
         Set the end_year to the current year by default
         Set the start_year to 10 or 20 years in the past based on the presence of an API key
             Registered Users can request up to 20 years per query
             Unregistered users may request up to 10 years per query
         """
-        self.start_year = str(int(datetime.strftime(datetime.now(),"%Y")) - (9 if api_key == '' else 19))
-        self.end_year = str(int(datetime.strftime(datetime.now(),"%Y")))
+        current_year = datetime.now().year
+        self.start_year = str(current_year - (9 if api_key == '' else 19))
+        self.end_year = str(current_year)
+
+    @staticmethod
+    def _cache_key(data: dict) -> str:
+        """Hash a request payload into a cache key, ignoring series order."""
+        payload = {**data, "seriesid": sorted(data["seriesid"])}
+        return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _cache_get(self, key: str):
+        """Return the cached value for key, or None if it is missing or expired."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._cache[key]
+                return None
+            return value
+
+    def _cache_set(self, key: str, value, ttl: int) -> None:
+        """Store value under key for ttl seconds, evicting any expired entries."""
+        now = time.monotonic()
+        with self._cache_lock:
+            expired = [cached_key for cached_key, (expires_at, _) in self._cache.items() if expires_at <= now]
+            for cached_key in expired:
+                del self._cache[cached_key]
+            self._cache[key] = (now + ttl, value)
+
+    @staticmethod
+    def _stream_series(response) -> tuple:
+        """Incrementally parse a streamed timeseries response.
+        
+        Reads the top-level fields (status, message, ...) up to the Results object, then hands
+        the remaining parse events to ijson so each series is built only as it is consumed.
+        
+        Returns:
+            Tuple of the top-level fields dict and a lazy iterator over Results.series
+        """
+        response.raw.decode_content = True
+        events = ijson.parse(response.raw, use_float=True)
+        json_data = {}
+        for prefix, event, value in events:
+            if prefix == 'Results' and event == 'start_map':
+                break
+            if prefix == 'message' and event == 'start_array':
+                json_data['message'] = []
+            elif prefix == 'message.item':
+                json_data['message'].append(value)
+            elif '.' not in prefix and event in ('string', 'number', 'boolean', 'null'):
+                json_data[prefix] = value
+        return json_data, ijson.items(events, 'Results.series.item')
+
+    def _optional_params(self, catalog, calculations, annual_average, aspects, all_optional_params) -> tuple:
+        """Apply all_optional_params and the API key requirement to the optional query parameters."""
+        if all_optional_params:
+            if self.api_key != '': 
+                catalog = calculations = annual_average = aspects = True
+
+        if self.api_key == '':
+            catalog = calculations = annual_average = aspects = False
+
+        return catalog, calculations, annual_average, aspects
 
     def generate_laus(self, fips_state):
         '''
@@ -70,21 +263,9 @@ class BLS:
             'LASST060000000000007',
             'LASST060000000000008']}
         '''
-        fips_state = str(fips_state)
-        if len(fips_state) < 2:
-            fips_state = '0' + fips_state
-        else:
-            fips_state = fips_state # just in case...
-
+        prefix = f'LASST{int(fips_state):02d}'
         response = {
-            'laus' : [
-                f'LASST{fips_state}0000000000003', # Unemployment Rate
-                f'LASST{fips_state}0000000000004', # Unemployment
-                f'LASST{fips_state}0000000000005', # Employment
-                f'LASST{fips_state}0000000000006', # Labor Force
-                f'LASST{fips_state}0000000000007', # Employment-Populatio Ratio
-                f'LASST{fips_state}0000000000008', # Labor Force Participation Rate
-            ]
+            'laus' : [prefix + tail for tail in _LAUS_TAILS]
         }
         
         return(response)
@@ -97,22 +278,9 @@ class BLS:
             'LASST060000000000004'
             ]}
         '''
-        fips_state = str(fips_state)
-        if len(fips_state) < 2:
-            fips_state = '0' + fips_state
-
+        prefix = f'SMS{int(fips_state):02d}'
         response = {
-            'ces' : [
-                f'SMS{fips_state}000000000000001', # Total Nonfarm, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000000500000001', # Total Private, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000000600000001', # Goods Producing, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000000700000001', # Service-Providing, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000000800000001', # Private Service Providing, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000001000000001', # Mining/Logging, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000001500000001', # Mining/Logging/Construction, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000002000000001', # Construction, All Employees, In Thousands, Seasonally Adjusted
-                f'SMS{fips_state}000001500000001', # Mining/Logging/Construction, All Employees, In Thousands, Seasonally Adjusted
-            ]
+            'ces' : [prefix + tail for tail in _CES_TAILS]
         }
         
         return(response)
@@ -127,7 +295,10 @@ class BLS:
             annual_average: bool = False,
             aspects : bool = False,
             all_optional_params : bool = False,
-            return_raw_response : bool = False
+            return_raw_response : bool = False,
+            return_dataframe : bool = False,
+            cache_ttl : int = 0,
+            stream : bool = False
             ):
         """Retrieve values from multiple series. Note that a BLS registration key is required to retreive optional parameters.
         
@@ -140,13 +311,55 @@ class BLS:
             annual_average -- Optional.
             aspects -- Optional.
             all_optional_params -- Optional. Sets all other optional parameters to True
-            return_raw_response -- Optional. Returns the raw response without any handling.
+            return_raw_response -- Optional. Returns the raw response without any handling. Statuses retried by the session (403, 413, 429, 500, 502, 503, 504) still raise RetryError once retries run out, so only other error responses are returned.
+            return_dataframe -- Optional. Returns the series data as a pandas DataFrame instead of a list of dicts.
+            cache_ttl -- Optional. Seconds to reuse a successful result for identical queries, 0 disables caching.
+            stream -- Optional. Parses the response incrementally with ijson to lower peak memory on large pulls. Unparseable responses raise BLSError instead of returning the response, since its body has already been consumed.
         Raises:
-            Not configured at this time.
+            BLSError: If more than 50 series are requested, or a streamed response cannot be parsed
+            requests.exceptions.RetryError: If the API keeps responding with a retried status (403, 413, 429, 500, 502, 503, 504) after all retries
+            requests.HTTPError: If the API responds with any other error status and return_raw_response is False
+        """
+
+        series_data = self._query_series(
+            series_list,
+            start_year=start_year,
+            end_year=end_year,
+            catalog=catalog,
+            calculations=calculations,
+            annual_average=annual_average,
+            aspects=aspects,
+            all_optional_params=all_optional_params,
+            return_raw_response=return_raw_response,
+            cache_ttl=cache_ttl,
+            stream=stream
+        )
+        if isinstance(series_data, tuple):
+            series_data = _format_rows(*series_data, return_dataframe)
+        return(series_data)
+
+    def _query_series(
+            self,
+            series_list : list,
+            start_year = None,
+            end_year = None,
+            catalog : bool = False,
+            calculations : bool = False,
+            annual_average: bool = False,
+            aspects : bool = False,
+            all_optional_params : bool = False,
+            return_raw_response : bool = False,
+            cache_ttl : int = 0,
+            stream : bool = False
+            ):
+        """Run a timeseries query for get_series and get_series_many, see get_series for the arguments.
+        
+        Returns:
+            Tuple of column names and row tuples on success, otherwise the value get_series returns as-is
         """
 
-        if len(series_list) > 50:
-            raise BLSError(f"Maximum of 50 series allowed per query. Attempted to query for {len(series_list)} series. Please retry with less series.")
+        if len(series_list) > MAX_SERIES_PER_QUERY:
+            raise BLSError(f"Maximum of {MAX_SERIES_PER_QUERY} series allowed per query. Attempted to query for {len(series_list)} series. Please retry with less series.")
 
         if start_year is None:
             start_year = self.start_year
@@ -157,12 +370,8 @@ class BLS:
         else:
             end_year = str(end_year)
 
-        if all_optional_params:
-            if self.api_key != '': 
-                catalog = calculations = annual_average = aspects = True
-
+        catalog, calculations, annual_average, aspects = self._optional_params(catalog, calculations, annual_average, aspects, all_optional_params)
         if self.api_key == '':
-            catalog = calculations = annual_average = aspects = False
             warnings.warn("Optional parameters disabled - API key required", BLSWarning)
         
         data = {
@@ -176,14 +385,26 @@ class BLS:
             "registrationkey" : self.api_key
             }
         
-        print(data)
+        logger.debug("BLS timeseries query: %s", {**data, "registrationkey": "***" if self.api_key else ""})
+
+        cache_key = None
+        if cache_ttl > 0 and not return_raw_response:
+            cache_key = self._cache_key(data)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return(cached)
+
+        if return_raw_response:
+            stream = False
+        elif stream and ijson is None:
+            warnings.warn("Streaming disabled - ijson is not installed", BLSWarning)
+            stream = False
 
-        request_url = f"{self.api_url['base_url']}{self.api_url['endpoints']['timeseries'][0]}"
-        
         response = self.session.post(
-            request_url,
+            self._timeseries_url,
             json=data,
-            headers=self.headers
+            headers=self.HEADERS,
+            stream=stream
         )
 
         if return_raw_response:
@@ -192,69 +413,102 @@ class BLS:
         series_data = ''
 
         try:
-            json_data = response.json()
+            if stream and not response.ok:
+                response.content # Read the error body so the connection goes back to the pool
+            response.raise_for_status()
+
+            if stream:
+                json_data, bls_series = self._stream_series(response)
+            else:
+                json_data = _json_loads(response.content)
             bls_response = json_data['status']
 
             if bls_response == 'REQUEST_NOT_PROCESSED':
-                print(json_data['status'])
-                print(json_data['message'])
+                logger.warning("BLS request not processed: %s", json_data.get('message'))
                 series_data = json_data
             elif bls_response == "REQUEST_SUCCEEDED":
-                bls_series = json_data['Results']['series']
-
-                """
-                2025.01.26 -- Hamza Amjad
-                Note to self -- not including any period validation
-                Python example on https://www.bls.gov/developers/api_python.htm
-                Includes the following validation
-                if 'M01' <= period <= 'M12':
-                    x.add_row([seriesId,year,period,value,footnotes[0:-1]])
-                
-                2025.02.01 -- Hamza Amjad
-                If annualaverage is set to true, it is returned as M13 in the data set
-                So that needs to be handled appropriately. For now, not adding handling for this
-                I likely won't need annual averages for the work I'm doing at the moment
-                """
-                series_data = [
-                    {
-                        "series_id": series["seriesID"],
-                        **(
-                            {
-                                "series_title": series.get("catalog", {}).get("series_title"),
-                                "seasonality": series.get("catalog", {}).get("seasonality"),
-                                "measure_data_type": series.get("catalog", {}).get("measure_data_type"),
-                                "commerce_industry": series.get("catalog", {}).get("commerce_industry"),
-                                "commerce_sector": series.get("catalog", {}).get("commerce_sector"),
-                            } if catalog else {}
-                        ),
-                        "year": data["year"],
-                        "period": data["period"], 
-                        "period_name": data["periodName"],
-                        "value": data["value"],
-                        "footnotes": data["footnotes"] if "footnotes" in data else "",
-                        **(
-                            {
-                                "aspects": data.get("aspects", {})
-                            } if aspects else {}
-                        ),
-                        **(
-                            {
-                                f"{calc_type}_{period}": value
-                                for calc_type, periods in data.get("calculations", {}).items()
-                                for period, value in periods.items()
-                            } if calculations else {}
-                        ),
-                    }
-                    for series in bls_series
-                    for data in series.get("data", [])
-                ]
+                if not stream:
+                    bls_series = json_data['Results']['series']
+
+                columns, rows = _flatten_series(bls_series, catalog, calculations, aspects)
+                if cache_key is not None:
+                    self._cache_set(cache_key, (columns, rows), cache_ttl)
+                series_data = (columns, rows)
+
+            if stream:
+                response.content # Read whatever ijson left unread so the connection goes back to the pool
             return(series_data)
-        except Exception as e:
-            print(f"Error occurred: {str(e)}")
+        except _PARSE_ERRORS as e:
+            if stream:
+                # The streamed body has been partly consumed and is closed below, so there is nothing useful to return
+                raise BLSError(f"Could not parse streamed BLS response: {e}") from e
+            logger.warning("Could not parse BLS response, returning raw response: %s", e)
             """
             2025.01.26 -- Hamza Amjad
             Note to self -- For any unhandled errors
             Return the response for manual checking
             """
             series_data = response
-            return(series_data)
\ No newline at end of file
+            return(series_data)
+        finally:
+            if stream:
+                response.close()
+
+    def get_series_many(
+            self,
+            series_lists : dict,
+            **kwargs
+            ) -> dict:
+        """Retrieve values for several groups of series using as few queries as possible.
+        Series IDs from all groups are combined into queries of up to 50 series, which are sent concurrently, and the results are split back out by group.
+        
+        Args:
+            series_lists -- Required. Dict of group name to list of series IDs, e.g. the output of generate_laus
+            **kwargs -- Optional. Passed through to get_series
+        Returns:
+            Dict of group name to the list of rows (or DataFrame, with return_dataframe) for that group's series
+        Raises:
+            BLSError: If return_raw_response is requested or a query does not return series data
+        """
+
+        if kwargs.get("return_raw_response"):
+            raise BLSError("return_raw_response is not supported by get_series_many.")
+        return_dataframe = kwargs.pop("return_dataframe", False)
+
+        catalog, calculations, _, aspects = self._optional_params(
+            kwargs.get("catalog", False),
+            kwargs.get("calculations", False),
+            kwargs.get("annual_average", False),
+            kwargs.get("aspects", False),
+            kwargs.get("all_optional_params", False)
+        )
+        columns = _SCHEMA_CACHE[bool(catalog) | bool(calculations) << 1 | bool(aspects) << 2]
+
+        owners = {}
+        for key, series_list in series_lists.items():
+            for series_id in series_list:
+                keys = owners.setdefault(series_id, [])
+                if key not in keys:
+                    keys.append(key)
+
+        flat = list(owners)
+        chunks = [flat[i:i + MAX_SERIES_PER_QUERY] for i in range(0, len(flat), MAX_SERIES_PER_QUERY)]
+
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_QUERIES, len(chunks))) as executor:
+                chunk_data = list(executor.map(lambda chunk: self._query_series(chunk, **kwargs), chunks))
+        else:
+            chunk_data = [self._query_series(chunk, **kwargs) for chunk in chunks]
+
+        results = {key: [] for key in series_lists}
+        for chunk, series_data in zip(chunks, chunk_data):
+            if not isinstance(series_data, tuple):
+                details = ""
+                if isinstance(series_data, dict):
+                    details = f" BLS status: {series_data.get('status')}, message: {series_data.get('message')}"
+                raise BLSError(f"Query for series {chunk[0]} through {chunk[-1]} did not return series data.{details}")
+            for row in series_data[1]:
+                for key in owners[row[0]]:
+                    results[key].append(row)
+
+        return({key: _format_rows(columns, rows, return_dataframe) for key, rows in results.items()})
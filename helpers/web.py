@@ -2,6 +2,7 @@
 """HTTP session utilities with retry, timeout, and logging capabilities."""
 
 from typing import Optional, Set
+import threading
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
@@ -11,12 +12,46 @@ DEFAULT_TIMEOUT = 5
 DEFAULT_RETRIES = 3
 DEFAULT_STATUS_CODES = frozenset([403, 413, 429, 500, 502, 503, 504])
 DEFAULT_HTTP_METHODS = frozenset(['GET', 'POST', 'PUT', 'DELETE', 'HEAD'])
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 50
+DEFAULT_BACKOFF_FACTOR = 0.1
+
+# Retry instances are immutable (increment() returns a copy), so one default policy is shared by all sessions
+_DEFAULT_RETRY = Retry(
+    total=DEFAULT_RETRIES,
+    backoff_factor=DEFAULT_BACKOFF_FACTOR,
+    allowed_methods=DEFAULT_HTTP_METHODS,
+    status_forcelist=DEFAULT_STATUS_CODES,
+    respect_retry_after_header=False
+)
+
+_DEFAULT_SESSION: Optional[requests.Session] = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
 
 # -- Exceptions ---------------------------------------------------------------------------
 class SessionConfigError(Exception):
     """Raised when session configuration parameters are invalid."""
     pass
 
+# -- Adapters ----------------------------------------------------------------------------
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request it sends."""
+
+    def __init__(self, *args, timeout: int = DEFAULT_TIMEOUT, **kwargs) -> None:
+        """Initialize the adapter.
+        
+        Args:
+            timeout: Request timeout in seconds, used when the caller does not set one
+        """
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        # Session.send always passes timeout, so setdefault would never apply
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
 # -- SessionManager ------------------------------------------------------------------------
 class SessionManager:
     """Manages HTTP sessions with retry and timeout capabilities."""
@@ -42,8 +77,8 @@ class SessionManager:
         self._validate_params(timeout, retry)
         self.timeout = timeout
         self.retry = retry
-        self.status_codes = status_codes or DEFAULT_STATUS_CODES
-        self.http_methods = http_methods or DEFAULT_HTTP_METHODS
+        self.status_codes = frozenset(status_codes) if status_codes else DEFAULT_STATUS_CODES
+        self.http_methods = frozenset(http_methods) if http_methods else DEFAULT_HTTP_METHODS
         
     @staticmethod
     def _validate_params(timeout: int, retry: int) -> None:
@@ -72,24 +107,46 @@ class SessionManager:
         """
         try:
             session = requests.Session()
-            session.request = lambda method, url, **kwargs: requests.request(method, url, timeout=self.timeout, **kwargs)
             
-            max_retries = Retry(
-                total=self.retry,
-                backoff_factor=0.1,
-                allowed_methods=frozenset(self.http_methods),
-                status_forcelist=frozenset(self.status_codes),
-                respect_retry_after_header=False
-            )
+            if (self.retry, self.status_codes, self.http_methods) == (DEFAULT_RETRIES, DEFAULT_STATUS_CODES, DEFAULT_HTTP_METHODS):
+                max_retries = _DEFAULT_RETRY
+            else:
+                max_retries = Retry(
+                    total=self.retry,
+                    backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                    allowed_methods=self.http_methods,
+                    status_forcelist=self.status_codes,
+                    respect_retry_after_header=False
+                )
 
-            adapter = HTTPAdapter(
-                max_retries=max_retries
+            adapter = TimeoutHTTPAdapter(
+                timeout=self.timeout,
+                max_retries=max_retries,
+                pool_connections=DEFAULT_POOL_CONNECTIONS,
+                pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                pool_block=False
                 )
             
             session.mount('https://', adapter)
             session.mount('http://', adapter)
             
-            session.hooks['response'] = [lambda response, *args, **kwargs: response.raise_for_status()]
             return session
         except SessionConfigError as e:
-            raise
\ No newline at end of file
+            raise
+
+# -- Shared Session -----------------------------------------------------------------------
+def get_default_session() -> requests.Session:
+    """Return a process-wide session built with the default SessionManager settings.
+    
+    The session is created on first use and reused afterwards so its connection
+    pool stays warm across API client instances.
+    
+    Returns:
+        requests.Session: Shared session object
+    """
+    global _DEFAULT_SESSION
+    if _DEFAULT_SESSION is None:
+        with _DEFAULT_SESSION_LOCK:
+            if _DEFAULT_SESSION is None:
+                _DEFAULT_SESSION = SessionManager().create_session()
+    return _DEFAULT_SESSION